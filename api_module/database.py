@@ -4,6 +4,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from api_module.json_utils import loads_json
+
 load_dotenv()
 
 # Fetch variables
@@ -21,7 +23,8 @@ if not (USER and PASSWORD and HOST and PORT and DBNAME):
 DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
 # Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# psycopg2 decodes every json/jsonb column through this
+engine = create_engine(DATABASE_URL, json_deserializer=loads_json)
 
 # Test the connection
 """
@@ -0,0 +1,14 @@
+# api_module/json_utils.py
+# Leaf module (stdlib + orjson only) so the DB engine and the chatbot tools share one decoder.
+import json
+from typing import Any
+
+import orjson
+
+
+def loads_json(s: str | bytes) -> Any:
+    """orjson.loads, retried with json.loads for what orjson rejects (NaN/Infinity literals)."""
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        return json.loads(s)
@@ -15,7 +15,7 @@ from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.retrievers import BaseRetriever
 import warnings
-import json
+import functools
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="langchain")
 
 
@@ -27,7 +27,6 @@ from api_module.utilities import (
 )
 from chatbot_module.prompts import (
     system_message,
-    meta_parser_system_prompt,
     translate_tr_to_en_system_message,
     translate_en_to_tr_system_message,
     interpretation_system_prompt
@@ -35,8 +34,11 @@ from chatbot_module.prompts import (
 from chatbot_module.tools import (
     get_seen_players_from_history, 
     filter_players_by_seen,
+    SeenPlayerFilter,
     strip_meta_stats_text,
     compose_selection_preamble,
+    detect_lang,
+    dumps_json,
     is_turkish,
     is_same_club,
     is_turkish_nationality,
@@ -97,7 +99,6 @@ CANDIDATE_RETRIEVER = get_retriever(k=40, filter=None)
 BROAD_CANDIDATE_RETRIEVER = get_retriever(k=60, filter=None)
 FILTERED_CONTEXT_DOCS = 10
 
-
 class StaticDocsRetriever(BaseRetriever):
     docs: List[Document]
 
@@ -289,22 +290,29 @@ def add_language_strategy_to_prompt(
     strategy: Optional[str],
     preamble_text: Optional[str] = None
 ) -> ChatPromptTemplate:
-    sys_msg = system_message
+    # Static system_message goes first as its own message so every call shares the
+    # same cacheable prefix; per-session strategy / intent hints follow it.
+    dynamic_msg = ""
 
     if strategy:
-        sys_msg += "\n\nCurrent scouting strategy / philosophy (must be followed):\n" + strategy + "\n"
+        dynamic_msg += "Current scouting strategy / philosophy (must be followed):\n" + strategy + "\n"
 
     if preamble_text:
-        sys_msg += "\n\nSession selection rules / intent hints (must be followed):\n" + preamble_text + "\n"
+        if dynamic_msg:
+            dynamic_msg += "\n"
+        dynamic_msg += "Session selection rules / intent hints (must be followed):\n" + preamble_text + "\n"
 
     # IMPORTANT: no {preamble} variable anymore
-    return ChatPromptTemplate.from_messages([
-        ("system", sys_msg),
+    messages = [("system", system_message)]
+    if dynamic_msg:
+        messages.append(("system", dynamic_msg))
+    messages.append(
         ("human",
          "{context}\n\n"
          "Question: {question}"
         )
-    ])
+    )
+    return ChatPromptTemplate.from_messages(messages)
 
 def get_session_state(session_id: str) -> tuple[str, list]:
     db = get_db()
@@ -324,6 +332,8 @@ def translate_to_english_if_needed(text: Optional[str], lang: str) -> str:
     original = text or ""
     if not is_turkish(lang):  # <--- prevent translation unless TR
         return original
+    if detect_lang(original) == "en":  # already English, skip the LLM round-trip
+        return original
     try:
         translated = translate_chain.invoke({"text": original}).strip()
         return translated or original
@@ -362,11 +372,16 @@ def create_qa_chain(
 
 # ===== Player Meta Parser =====
 
-meta_parser_prompt = ChatPromptTemplate.from_messages([            
-    ("system", meta_parser_system_prompt),
-    ("human", "Text:\n\n{raw_text}\n\nReturn only JSON, no backticks.")
-])
-meta_parser_chain = meta_parser_prompt | PARSER_LLM | StrOutputParser()
+@functools.cache
+def get_meta_parser_chain():
+    # Built on first parse so importing the chatbot doesn't materialize the parser prompt.
+    from chatbot_module.prompts import meta_parser_system_prompt
+
+    meta_parser_prompt = ChatPromptTemplate.from_messages([
+        ("system", meta_parser_system_prompt),
+        ("human", "Text:\n\n{raw_text}\n\nReturn only JSON, no backticks.")
+    ])
+    return meta_parser_prompt | PARSER_LLM | StrOutputParser()
 
 # ===== Translate (TR -> EN, or passthrough EN) =====
 translate_prompt = ChatPromptTemplate.from_messages([
@@ -412,7 +427,7 @@ def answer_question(
 
     # 2) Compute seen players from PRIOR assistant messages ONLY
     seen_players = get_seen_players_from_history(ai_msgs)
-    seen_list_lower = { (n or "").lower().strip() for n in seen_players }
+    seen_filter = SeenPlayerFilter(seen_players)
     # 3) Build selection preamble (semantic, no keyword parsing)
     preamble = compose_selection_preamble(seen_players, strategy)
     # 4) Translate user question to English if needed (TR -> EN, EN passthrough)
@@ -454,9 +469,9 @@ def answer_question(
             'Before answering, silently verify that this is a real transfer target from a different club.\n\n'
         )
     # 5) Intent hint — ONLY entity resolution (seen name), no keyword lists
-    q_lower = (question or "").lower()
-    tq_lower = (translated_question or "").lower()
-    mentions_seen_by_name = any(n and (n in q_lower or n in tq_lower) for n in seen_list_lower)
+    q_lower = (question or "").casefold()
+    tq_lower = (translated_question or "").casefold()
+    mentions_seen_by_name = any(n in q_lower or n in tq_lower for n in seen_filter.keys())
     # Let the LLM infer intent semantically using the preamble rules.
     if mentions_seen_by_name:
         intent_nudge = (
@@ -568,7 +583,7 @@ def answer_question(
 
         for attempt_idx in range(1, 3):
             # print(f"[answer] selection_attempt='{attempt_idx}'", flush=True)
-            meta = parse_player_meta_new(meta_parser_chain, raw_text=base_answer)
+            meta = parse_player_meta_new(get_meta_parser_chain(), raw_text=base_answer)
             players = meta.get("players") or []
             # print(f"[answer] parsed_players={players}", flush=True)
 
@@ -601,7 +616,7 @@ def answer_question(
                     continue
 
             # Keep only NEW players for data payload (so cards/plots are printed once per player)
-            meta_new, new_names = filter_players_by_seen(meta, seen_players)
+            meta_new, new_names = filter_players_by_seen(meta, seen_filter)
             # Build structured data for NEW players only (no HTML/PNGs)
             payload = build_player_payload_new(meta_new) if new_names else {"players": []}
             # print(f"[answer] new_names={sorted(new_names) if new_names else []}", flush=True)
@@ -724,12 +739,12 @@ def answer_question(
             profile_meta = p0.get("meta") or {}
             stats = p0.get("stats") or []
             # Build compact inputs for the interpretation LLM
-            profile_json = json.dumps({
+            profile_json = dumps_json({
                 "name": p0.get("name"),
                 **profile_meta
-            }, ensure_ascii=False)
+            })
 
-            stats_json = json.dumps(stats, ensure_ascii=False)
+            stats_json = dumps_json(stats)
 
             out = interpretation_chain.invoke({
                 "question": translated_question,
@@ -738,7 +753,7 @@ def answer_question(
                 "stats_json": stats_json,
             }).strip()
         memory_out = out
-        if is_turkish(lang):
+        if is_turkish(lang) and detect_lang(memory_out) != "tr":
             try:
                 translated_out = output_tr_translate_chain.invoke({"text": memory_out}).strip()
                 if translated_out:
@@ -746,14 +761,13 @@ def answer_question(
             except Exception as e:
                 pass
         
-        stored_ai_content = "[[PAYLOAD_JSON]]\n" + json.dumps(payload, ensure_ascii=False) + "\n[[/PAYLOAD_JSON]]" + "\n\n" + memory_out
+        stored_ai_content = "[[PAYLOAD_JSON]]\n" + dumps_json(payload) + "\n[[/PAYLOAD_JSON]]" + "\n\n" + memory_out
         db = get_db()
         try:
             append_chat_message(db, session_id, "human", translated_question)
             append_chat_message(db, session_id, "ai", stored_ai_content)
         finally:
             db.close()
-
         return {"answer": out, "data": payload}
 
 
@@ -1,10 +1,14 @@
 from typing import Any, Dict, List, Optional
+import copy
+import hashlib
 import json
 import os
 import random
 import re
+import threading
 import warnings
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage
 from langchain_core.output_parsers import StrOutputParser
@@ -39,9 +43,11 @@ from chatbot_module.prompts_agentic import (
 from chatbot_module.prompts import translate_tr_to_en_system_message
 from chatbot_module.tools import (
     collect_recent_human_constraints,
+    dumps_json,
     get_seen_players_from_history,
     is_generic_alternative_request,
     is_turkish,
+    normalize_query,
 )
 from constants_module.constants import ROLE_LONG_TO_SHORT
 from chatbot_module.tools_agentic import (
@@ -389,20 +395,23 @@ def _log_trace(trace: Dict[str, Any], *, session_id: str, outcome: str) -> None:
         f"total_search_cost_usd={_trace_cost_usd(trace):.6f} ",
         flush=True,
     )
+    # Detail sections go out as one write/flush instead of one per line.
+    detail: List[str] = []
     if constraints:
-        print("[agentic_flow:constraints]", flush=True)
+        detail.append("[agentic_flow:constraints]")
         for key in sorted(constraints):
-            print(f"  {key}: {json.dumps(constraints.get(key), ensure_ascii=False, default=str)}", flush=True)
+            detail.append(f"  {key}: {json.dumps(constraints.get(key), ensure_ascii=False, default=str)}")
     if fetched_options:
-        print("[agentic_flow:fetched_players]", flush=True)
-        for option in fetched_options:
-            print(f"  {option}", flush=True)
+        detail.append("[agentic_flow:fetched_players]")
+        detail.extend(f"  {option}" for option in fetched_options)
     if selector_options:
-        print("[agentic_flow:selector_players]", flush=True)
+        detail.append("[agentic_flow:selector_players]")
         selected_prefix = f"{selector.get('selected_index')}:"
         for option in selector_options:
             marker = " <- selected" if selected_prefix != "None:" and option.startswith(selected_prefix) else ""
-            print(f"  {option}{marker}", flush=True)
+            detail.append(f"  {option}{marker}")
+    if detail:
+        print("\n".join(detail), flush=True)
 
 def _recent_memory_text(history_rows: list, limit: int = 8) -> str:
     rows = history_rows[-limit:] if history_rows else []
@@ -419,7 +428,7 @@ def _persist_turn(session_id: str, human_text: str, ai_text: str, payload: Optio
     stored_payload = payload if payload is not None else {"players": []}
     stored_ai_content = (
         "[[PAYLOAD_JSON]]\n"
-        + json.dumps(stored_payload, ensure_ascii=False)
+        + dumps_json(stored_payload)
         + "\n[[/PAYLOAD_JSON]]"
         + "\n\n"
         + (ai_text or "")
@@ -432,6 +441,18 @@ def _persist_turn(session_id: str, human_text: str, ai_text: str, payload: Optio
         db.close()
 
 
+# Validated recommendations for opening turns, keyed on (question, lang, strategy).
+# Only sessions without history read or write it: follow-ups depend on the session's
+# memory, seen players and carried constraints, so they are never shared.
+SCOUTING_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+_SCOUTING_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _scouting_cache_key(question: str, lang: str, strategy: Optional[str]) -> bytes:
+    query_part = "\x1f".join([normalize_query(question), lang or "", (strategy or "").strip()])
+    return hashlib.blake2b(query_part.encode("utf-8"), digest_size=16).digest()
+
+
 def _extract_payload_json(content: str) -> Dict[str, Any]:
     text = content or ""
     match = re.search(r"\[\[PAYLOAD_JSON\]\]\s*(\{[\s\S]*?\})\s*\[\[/PAYLOAD_JSON\]\]", text)
@@ -661,7 +682,7 @@ def _score_candidate_with_ai(
     payload = {
         "question": question,
         "strategy": strategy or "",
-        "candidate_json": json.dumps(compact_candidate, ensure_ascii=False),
+        "candidate_json": dumps_json(compact_candidate),
     }
     if trace is not None:
         _trace_step(trace, "agent", "scoring")
@@ -789,8 +810,8 @@ def _answer_named_comparison(
     payload = {
         "question": translated_question,
         "strategy": strategy or "",
-        "player_a_json": json.dumps(_compact_comparison_player(resolved[0]), ensure_ascii=False),
-        "player_b_json": json.dumps(_compact_comparison_player(resolved[1]), ensure_ascii=False),
+        "player_a_json": dumps_json(_compact_comparison_player(resolved[0])),
+        "player_b_json": dumps_json(_compact_comparison_player(resolved[1])),
         "output_language": _output_language(lang),
     }
     if trace is not None:
@@ -1044,6 +1065,16 @@ def answer_question(
     trace = _new_trace()
     _trace_step(trace, "tool", "load_memory")
     lang, history_rows = get_session_state(session_id)
+    cache_key = None if history_rows else _scouting_cache_key(question, lang, strategy)
+    if cache_key is not None:
+        with _SCOUTING_RESPONSE_CACHE_LOCK:
+            cached = SCOUTING_RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            payload = copy.deepcopy(cached["data"])
+            _persist_turn(session_id, cached["translated_question"], cached["answer"], payload)
+            _trace_step(trace, "tool", "persist_memory")
+            _log_trace(trace, session_id=session_id, outcome="response_cache_hit")
+            return {"answer": cached["answer"], "data": payload}
     ai_msgs: List[AIMessage] = [
         AIMessage(content=row["content"])
         for row in history_rows
@@ -1607,6 +1638,14 @@ def answer_question(
         _trace_step(trace, "tool", "persist_memory")
         _persist_turn(session_id, ctx.translated_question, memory_out, payload)
         _log_trace(trace, session_id=session_id, outcome="agentic_success")
+        # only answers whose candidate passed scoring/validation are reused
+        if cache_key is not None:
+            with _SCOUTING_RESPONSE_CACHE_LOCK:
+                SCOUTING_RESPONSE_CACHE[cache_key] = {
+                    "answer": answer,
+                    "data": copy.deepcopy(payload),
+                    "translated_question": ctx.translated_question,
+                }
         return {"answer": answer, "data": payload}
 
     except Exception as exc:
@@ -1,4 +1,8 @@
-ALLOWED_METRICS = {
+import sys
+
+# Ordered source of truth: prompts enumerate the metrics in this order.
+# Interned so metric keys decoded from DB rows / LLM output can share these objects.
+ALLOWED_METRIC_NAMES = tuple(map(sys.intern, (
     "Duels Won", "Clearances", "Chances Created", "Accurate Crosses", "Clearance Offline",
     "Ball Recovery", "Saves Insidebox", "Man Of Match", "Penalties Committed",
     "Dispossessed", "Fouls", "Goals Conceded", "Shots On Target", "Shots On Target (%)",
@@ -16,7 +20,10 @@ ALLOWED_METRICS = {
     "Tackles Won (%)", "Aerials Lost", "Duels Won (%)", "Red Cards", "Captain",
     "Passes In Final Third", "Rating", "Fouls Drawn", "Error Lead To Shot",
     "Through Balls Won",
-}
+)))
+ALLOWED_METRICS = frozenset(ALLOWED_METRIC_NAMES)
+# Case-insensitive lookup back to the canonical spelling ("key passes" -> "Key Passes").
+ALLOWED_METRIC_BY_FOLD = {metric.casefold(): metric for metric in ALLOWED_METRIC_NAMES}
 
 POSITIVE_METRICS = {
     "Duels Won", "Clearances", "Chances Created", "Accurate Crosses", "Ball Recovery",
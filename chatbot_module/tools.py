@@ -1,9 +1,15 @@
+import io
 import re
-import json
+import functools
+import hashlib
+import threading
 import math
+import orjson
 import unicodedata
+from cachetools import LRUCache
 from typing import Dict, Any, Tuple, Iterable, Optional, List
 
+from api_module.json_utils import loads_json
 from api_module.utilities import ROLE_SHORT_TO_LONG
 
 LANG_DIRECTIVES = {
@@ -49,14 +55,22 @@ META_LINE_RE = re.compile(
     )\*\*:\s*.+$""",
     re.IGNORECASE | re.VERBOSE,
 )
-STATS_HEADER_RE = re.compile(r"^\s*\*\*Performance\s+Statistics\*\*\s*:?\s*$", re.IGNORECASE)
-STATS_ITEM_RE = re.compile(
-    r"^\s*(?:\d+\.\s+|\-\s+\*\*[^*]+?\*\*:\s+).+?$",
-    re.IGNORECASE,
+# Whitespace-free, case-folded forms of the META_LINE_RE labels. A bullet whose label
+# isn't one of these can't match, so the regex only runs to confirm real meta bullets.
+_META_LABEL_KEYS = frozenset({
+    "nationality", "age", "age(asof2025)", "age(2025)", "primaryrole",
+    "secondaryrole", "secondaryroles", "role", "roles", "potential", "form",
+})
+# Non-ASCII characters re.IGNORECASE treats as equal to ASCII letters
+_META_LABEL_FOLD = str.maketrans({"ı": "i", "İ": "i", "ſ": "s", "\u212a": "k"})
+MULTI_BLANK_LINES_RE = re.compile(r"\n{3,}")
+WHITESPACE_RE = re.compile(r"\s+")
+NON_WORD_RE = re.compile(r"[^\w\s]")
+CLUB_SUFFIX_RE = re.compile(
+    r"\b(a\.?s\.?|as|sk|sc|fc|cf|ac|afc|jk|fk|club|kulubu|kulubu|spor kulubu|sports club)\b"
 )
-PROFILE_BLOCK_RE = re.compile(
-    r"\[\[\s*PLAYER_PROFILE\s*:\s*(?P<name>[^\]]+)\s*\]\](?P<body>[\s\S]*?)\[\[\/PLAYER_PROFILE\]\]",
-    re.IGNORECASE
+CLUB_SQUAD_LABEL_RE = re.compile(
+    r"\b(u\d{2}|u\d{1,2}|under\s*\d{1,2}|b\s*team|reserves?|reserve|academy|ii|2nd team|second team|youth)\b"
 )
 BUL_NAT_RE  = re.compile(r"^\s*-\s*Nationality\s*:\s*(?P<val>.+?)\s*$", re.IGNORECASE)
 BUL_AGE_RE  = re.compile(r"^\s*-\s*Age(?:\s*\(.*?\))?\s*:\s*(?P<val>\d{1,3})\s*$", re.IGNORECASE)
@@ -159,6 +173,45 @@ COMMON_TURKISH_SURNAME_TOKENS = {
 
 # === GET SEEN PLAYERS TOOL ===
 
+def _strip_or_empty(s: Optional[str]) -> str:
+    return (s or "").strip()
+
+
+def _seen_key(name: Optional[str]) -> str:
+    return unicodedata.normalize("NFKC", name or "").strip().casefold()
+
+
+class SeenPlayerFilter:
+    """
+    Session-level view over the players already shown in a chat.
+    Membership is O(1) and insensitive to case / unicode form, so repeated
+    "has this player appeared before" checks never rescan the history.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: Dict[str, str] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: Optional[str]) -> None:
+        key = _seen_key(name)
+        if key:
+            self._names.setdefault(key, (name or "").strip())
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and _seen_key(name) in self._names
+
+    def __iter__(self):
+        return iter(self._names.values())
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def keys(self) -> Iterable[str]:
+        """Normalized names, for substring checks against folded user text."""
+        return self._names.keys()
+
+
 def get_seen_players_from_history(history) -> set[str]:
     """
     Scan ASSISTANT messages in history and collect player names from either:
@@ -168,32 +221,38 @@ def get_seen_players_from_history(history) -> set[str]:
     """
     seen = set()
 
-    def norm(s: str) -> str:
-        return (s or "").strip()
-
     for msg in history:
         role = getattr(msg, "type", "") or getattr(msg, "role", "")
         if "ai" in role or role == "assistant":
             content = getattr(msg, "content", "") or ""
+            # Substring gates: most assistant turns carry neither tag, so skip the regex scans.
+            tag_at = content.find("[[")
+            if tag_at < 0:
+                continue
+            # Both tags open with "[[", so nothing before the first one needs folding or scanning.
+            lowered = content[tag_at:].lower()
+
+            if "player_profile" in lowered:
+                for m in PLAYER_PROFILE_OPEN_TAG_RE.finditer(content, tag_at):
+                    name = _strip_or_empty(m.group(1))
+                    if name:
+                        seen.add(name)
 
-            for m in PLAYER_PROFILE_OPEN_TAG_RE.finditer(content):
-                name = norm(m.group(1))
-                if name:
-                    seen.add(name)
-
-            for m in PAYLOAD_JSON_BLOCK_RE.finditer(content):
+            if "payload_json" not in lowered:
+                continue
+            for m in PAYLOAD_JSON_BLOCK_RE.finditer(content, tag_at):
                 raw_json = (m.group("body") or "").strip()
                 if not raw_json:
                     continue
                 try:
-                    payload = json.loads(raw_json)
+                    payload = loads_json(raw_json)
                 except Exception:
                     continue
 
                 for player in (payload.get("players") or []):
                     if not isinstance(player, dict):
                         continue
-                    name = norm(player.get("name") or "")
+                    name = _strip_or_empty(player.get("name"))
                     if name:
                         seen.add(name)
     return seen
@@ -202,7 +261,38 @@ def get_seen_players_from_history(history) -> set[str]:
 
 def strip_heavy_html(text: str) -> str:
     """Remove <img> (esp. base64) and <table> blocks before sending to LLMs."""
-    return HEAVY_TAGS_RE.sub("", text or "").strip()
+    s = text or ""
+    if "<" not in s:
+        return s.strip()
+    low = s.lower()
+    if len(low) != len(s) or "ı" in s:
+        # lower() expanded a character (e.g. 'İ'), so offsets no longer line up; and
+        # IGNORECASE lets dotless 'ı' stand for 'i' ("<ımg"), which find() can't see
+        return HEAVY_TAGS_RE.sub("", s).strip()
+
+    # Literal find() scan, same matches as HEAVY_TAGS_RE without the regex engine
+    out: list[str] = []
+    i = 0
+    pos = 0
+    while True:
+        a = low.find("<img", pos)
+        b = low.find("<table", pos)
+        if a < 0 and b < 0:
+            break
+        if b < 0 or 0 <= a < b:
+            start, end = a, low.find(">", a + 4)
+            end = end + 1 if end >= 0 else -1
+        else:
+            start, end = b, low.find("</table>", b + 6)
+            end = end + 8 if end >= 0 else -1
+        if end < 0:
+            # unclosed tag: the regex would not match here either, keep scanning
+            pos = start + 1
+            continue
+        out.append(s[i:start])
+        i = pos = end
+    out.append(s[i:])
+    return "".join(out).strip()
 
 # ------------------------------------------------------------------------------
 # Plotting tool (per-player normalized bar charts for mixed scales)
@@ -234,6 +324,28 @@ def infer_limits(metric: str, value: float) -> Tuple[float, float]:
         return 0.0, upper
     return 0.0, _nice_ceiling(max(value * 1.2, 1.0))
 
+def dumps_json(obj: Any) -> str:
+    """Compact JSON for LLM inputs and persisted payloads (orjson: UTF-8 kept, no padding, several times faster than json.dumps)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+# === PARSER OUTPUT CACHE ===
+# Raw parser-chain output keyed by a hash of the exact input text, so the same answer
+# text (retries, repeated follow-ups) costs one parser LLM call.
+PARSER_OUTPUT_CACHE: LRUCache = LRUCache(maxsize=256)
+_PARSER_OUTPUT_CACHE_LOCK = threading.Lock()
+
+def invoke_parser_cached(chain, kind: str, inputs: Dict[str, str]) -> Any:
+    key = hashlib.sha1("\x1f".join([kind, *inputs.values()]).encode("utf-8")).digest()
+    with _PARSER_OUTPUT_CACHE_LOCK:
+        cached = PARSER_OUTPUT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    raw = chain.invoke(inputs)
+    if raw:
+        with _PARSER_OUTPUT_CACHE_LOCK:
+            PARSER_OUTPUT_CACHE[key] = raw
+    return raw
+
 # === PARSE STATISTICAL HIGHLIGHTS TOOL ===
 def parse_statistical_highlights(stats_parser_chain, report_text: str) -> Dict[str, Any]:
     """
@@ -245,7 +357,7 @@ def parse_statistical_highlights(stats_parser_chain, report_text: str) -> Dict[s
     """
     safe = strip_heavy_html(report_text)
     try:
-        raw = stats_parser_chain.invoke({"report_text": safe})
+        raw = invoke_parser_cached(stats_parser_chain, "stats", {"report_text": safe})
     except Exception as e:
         return {"players": []}
     
@@ -254,7 +366,7 @@ def parse_statistical_highlights(stats_parser_chain, report_text: str) -> Dict[s
     
     def safe_json_load(s: str) -> Dict[str, Any]:
         try:
-            return json.loads(s)
+            return loads_json(s)
         except Exception:
             return {}
 
@@ -286,29 +398,67 @@ def parse_statistical_highlights(stats_parser_chain, report_text: str) -> Dict[s
 
 # === FILTER SEEN PLAYERS TOOL ===
 
-def filter_players_by_seen(meta: Dict[str, Any], seen_names: set[str]):
+def filter_players_by_seen(meta: Dict[str, Any], seen_names: "set[str] | SeenPlayerFilter"):
     """
     Keep only players NOT already in 'seen_names'.
     Returns (filtered_meta, filtered_stats, new_player_names_set).
     """
-    def norm(n: str) -> str:
-        return (n or "").strip()
-
-    seen_norm = {norm(n) for n in (seen_names or set())}
+    seen = seen_names if isinstance(seen_names, SeenPlayerFilter) else SeenPlayerFilter(seen_names or ())
 
     meta_players = meta.get("players") or []
 
-    # All names in current answer
-    current_names = {norm(p.get("name") or "") for p in meta_players if p.get("name")}
+    # Normalize each name once; the filter below reuses it
+    named = [(_strip_or_empty(p.get("name")), p) for p in meta_players]
 
-    new_names = {n for n in current_names if n and n not in seen_norm}
+    new_names = {n for n, _ in named if n and n not in seen}
 
-    filt_meta = {"players": [p for p in meta_players if norm(p.get("name") or "") in new_names]}
+    filt_meta = {"players": [p for n, p in named if n in new_names]}
 
     return filt_meta, new_names
 
 # === STRIP META STATS TEXT TOOL ===
 
+# First characters of lines that can be a flag tag, an analysis header or a meta bullet
+_FLAG_OR_META_FIRSTCHARS = frozenset("[*-")
+
+def _is_meta_bullet(line: str) -> bool:
+    """META_LINE_RE.match(line), with plain bullets and unknown labels rejected before the regex."""
+    s = line.lstrip()
+    if not s.startswith("-"):
+        return False
+    s = s[1:].lstrip()
+    if not s.startswith("**"):
+        return False
+    end = s.find("**", 2)
+    if end < 0:
+        return False
+    key = "".join(s[2:end].translate(_META_LABEL_FOLD).lower().split())
+    return key in _META_LABEL_KEYS and META_LINE_RE.match(line) is not None
+
+
+def _skip_flag_block(lines: list[str], i: int) -> int:
+    """Index just past the flagged block opening at lines[i] (its END line, or EOF)."""
+    n = len(lines)
+    i += 1
+    while i < n and not (lines[i].lstrip().startswith("[[/") and FLAG_BLOCK_END_RE.match(lines[i])):
+        i += 1
+    return i + 1 if i < n else i
+
+
+def _name_or_analysis_header(s: str) -> str | None:
+    s_strip = (s or "").strip()
+    # cheap prefix gate: the analysis-header regex only matches "**...**" lines
+    m = PLAYER_ANALYSIS_HEADER_RE.fullmatch(s or "") if s_strip.startswith("**") else None
+    if m:
+        return (m.group("name") or "").strip()
+    # title() maps the first character on its own, so a first character that title()
+    # changes (e.g. a lowercase sentence start) rules the line out before the full copy.
+    head = s_strip[:1]
+    if head and head.title() == head and s_strip == s_strip.title() and len(s_strip.split()) >= 2:
+        return s_strip
+    return None
+
+
 def strip_meta_stats_text(text: str, known_names: list[str] | None = None) -> str:
     """
     Remove in this order:
@@ -322,62 +472,71 @@ def strip_meta_stats_text(text: str, known_names: list[str] | None = None) -> st
         return text
 
     lines = text.splitlines()
-    out: list[str] = []
+    buf = io.StringIO()
+    write = buf.write
 
-    # ---- (A) First pass: drop flagged blocks entirely ----
+    # Regexes only run behind C-level prefix gates; almost no narrative line starts with "[[" or "- **<label>**".
+    def flag_start(ln: str) -> bool:
+        return ln.lstrip().startswith("[[") and FLAG_BLOCK_START_RE.match(ln) is not None
+
+    meta_line = _is_meta_bullet
+
+    # Single left-to-right pass; flagged blocks are transparent to the header lookahead,
+    # exactly as if they had been removed first.
     i, n = 0, len(lines)
     while i < n:
         line = lines[i]
-        if FLAG_BLOCK_START_RE.match(line):
-            # Skip until matching END (or EOF)
+        # First visible character decides which checks can apply at all: a bare-name
+        # header needs a first character that title() leaves alone (uppercase, digit,
+        # punctuation), so blank lines and lowercase-led text are written straight through.
+        head = line.lstrip()[:1]
+        if not head or (head not in _FLAG_OR_META_FIRSTCHARS and head.title() != head):
+            write(line)
+            write("\n")
             i += 1
-            while i < n and not FLAG_BLOCK_END_RE.match(lines[i]):
-                i += 1
-            if i < n and FLAG_BLOCK_END_RE.match(lines[i]):
-                i += 1  # also skip the END line
-            continue  # continue outer loop
-        out.append(line)
-        i += 1
-
-    # Work on the remainder for legacy cleanups
-    lines = out
-    out = []
-    i, n = 0, len(lines)
-
-    def looks_like_name_or_analysis_header(s: str) -> str | None:
-        m = PLAYER_ANALYSIS_HEADER_RE.fullmatch(s or "")
-        if m:
-            return (m.group("name") or "").strip()
-        s_strip = (s or "").strip()
-        if s_strip and s_strip == s_strip.title() and len(s_strip.split()) >= 2:
-            return s_strip
-        return None
+            continue
 
-    while i < n:
-        line = lines[i]
+        # (A) Drop flagged blocks entirely
+        if head == "[" and flag_start(line):
+            i = _skip_flag_block(lines, i)
+            continue
 
-        # Drop a name/analysis header if followed by meta bullets or stats block
-        nm = looks_like_name_or_analysis_header(line)
-        if nm:
+        # (B) Drop a name/analysis header if followed by meta bullets or stats block
+        if _name_or_analysis_header(line):
             j = i + 1
             saw_meta = False
-            while j < n and (lines[j].strip() == "" or META_LINE_RE.match(lines[j])):
-                if META_LINE_RE.match(lines[j]):
+            blanks: list[str] = []
+            while j < n:
+                nxt = lines[j]
+                if flag_start(nxt):
+                    j = _skip_flag_block(lines, j)
+                elif meta_line(nxt):
                     saw_meta = True
-                j += 1
+                    j += 1
+                elif nxt.strip() == "":
+                    blanks.append(nxt)
+                    j += 1
+                else:
+                    break
             if saw_meta:
-                i += 1
-                continue  # skip the header line itself
+                # Lines up to j are already classified: keep blanks, drop meta and flagged blocks.
+                for blank in blanks:
+                    write(blank)
+                    write("\n")
+                i = j
+                continue
 
         # Remove meta bullet lines
-        if META_LINE_RE.match(line):
+        if head == "-" and meta_line(line):
             i += 1
             continue
 
-        out.append(line)
+        write(line)
+        write("\n")
         i += 1
 
-    cleaned = re.sub(r"\n{3,}", "\n\n", "\n".join(out)).strip()
+    # The trailing newline from the last write is removed by strip().
+    cleaned = MULTI_BLANK_LINES_RE.sub("\n\n", buf.getvalue()).strip()
     return cleaned
 
 
@@ -385,6 +544,10 @@ def strip_meta_stats_text(text: str, known_names: list[str] | None = None) -> st
 def normalize_name(s: str) -> str:
     return (s or "").strip().lower()
 
+def normalize_query(q: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so trivially different phrasings share cache keys."""
+    return WHITESPACE_RE.sub(" ", (q or "").lower().strip())
+
 def _fold_text(s: str) -> str:
     text = unicodedata.normalize("NFKD", s or "")
     text = "".join(ch for ch in text if not unicodedata.combining(ch))
@@ -393,18 +556,10 @@ def _fold_text(s: str) -> str:
 def normalize_club_name(s: str) -> str:
     text = _fold_text(s or "")
     text = text.replace("&", " and ")
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(
-        r"\b(a\.?s\.?|as|sk|sc|fc|cf|ac|afc|jk|fk|club|kulubu|kulubu|spor kulubu|sports club)\b",
-        " ",
-        text,
-    )
-    text = re.sub(
-        r"\b(u\d{2}|u\d{1,2}|under\s*\d{1,2}|b\s*team|reserves?|reserve|academy|ii|2nd team|second team|youth)\b",
-        " ",
-        text,
-    )
-    text = re.sub(r"\s+", " ", text).strip()
+    text = NON_WORD_RE.sub(" ", text)
+    text = CLUB_SUFFIX_RE.sub(" ", text)
+    text = CLUB_SQUAD_LABEL_RE.sub(" ", text)
+    text = WHITESPACE_RE.sub(" ", text).strip()
     return text
 
 def is_same_club(club_a: Optional[str], club_b: Optional[str]) -> bool:
@@ -1025,6 +1180,8 @@ def collect_recent_human_constraints(
     return constraints
 
 # ------- Language Adjustment --------
+# Language codes come from a handful of client values, so both helpers are memoized.
+@functools.lru_cache(maxsize=32)
 def _normalize_lang_code(code: Optional[str]) -> str:
     c = (code or "").lower().strip()
     if c.startswith("tr"):
@@ -1045,5 +1202,57 @@ def inject_language(base_system_message: str, lang_code: Optional[str]) -> str:
     core = base_system_message.strip()
     return f"{directive}\n\n{core}\n\n{directive}\n"
 
+@functools.lru_cache(maxsize=32)
 def is_turkish(lang: Optional[str]) -> bool:
     return (lang or "").lower().startswith("tr")
+
+TURKISH_SPECIFIC_CHARS = frozenset("çğıöşüÇĞİÖŞÜ")
+TURKISH_HINT_TOKENS = frozenset({
+    "bir", "ve", "icin", "için", "bana", "oyuncu", "oyuncuyu", "oner", "öner", "onersene", "önersene",
+    "baska", "başka", "biri", "var", "mi", "mı", "mu", "daha", "gibi", "olan", "takim", "takım",
+    "yas", "yaş", "genc", "genç", "hangi", "nasil", "nasıl", "kim", "ne", "bu", "cok", "çok",
+    "iyi", "istiyorum", "diger", "diğer", "ile", "ya", "de", "da", "yaşında", "altı", "ustu", "üstü",
+    # Turkish typed without Turkish letters, often mixed with English football words
+    "lazim", "lazım", "lutfen", "lütfen", "bul", "getir", "goster", "göster", "misin", "musun",
+    "yasinda", "alti", "en", "icin", "takima", "takıma", "takimi", "takımı", "oyunculari", "oyuncuları",
+    "forvet", "golcu", "golcü", "stoper", "kaleci", "kanat", "bek", "sol", "sag", "sağ", "orta",
+    "sahaci", "sahacı", "ortasaha", "defans", "hucum", "hücum", "genc", "yetenekli", "ucuz", "hizli", "hızlı",
+})
+# Only tokens that never occur as Turkish words; short ones ("a", "in", "me", ...) and
+# position slang that Turkish borrows ("bek"/"back") would misread Turkish queries as English.
+ENGLISH_HINT_TOKENS = frozenset({
+    "the", "for", "and", "with", "from", "are", "who", "which", "what",
+    "player", "players", "suggest", "recommend", "find", "give",
+    "another", "better", "best", "young", "compare", "about", "tell", "under", "older",
+    "striker", "winger", "midfielder", "defender", "goalkeeper", "forward",
+})
+# English needs this many distinct hint tokens before translation is skipped.
+ENGLISH_MIN_HINT_TOKENS = 2
+# Turkish case suffixes after an apostrophe on a proper noun: Galatasaray'a, Napoli'ye, Arsenal'da, Liverpool'un ...
+TURKISH_SUFFIX_RE = re.compile(
+    r"\w['’](?:y?[ae]|[dt][ae]n?|n?[ıiuü]n|y?[ıiuü]|y?l[ae])\b",
+    re.IGNORECASE,
+)
+
+def detect_lang(text: Optional[str]) -> Optional[str]:
+    """
+    Cheap TR/EN detector used to skip translation round-trips.
+    Returns "tr" or "en" only when the signal is one-sided, otherwise None
+    (callers must then fall back to the LLM translator). Any Turkish hint token,
+    letter or apostrophe suffix rules out "en", whatever English words appear.
+    """
+    raw = (text or "").strip()
+    if not raw:
+        return None
+    tokens = re.findall(r"\w+", raw.lower())
+    tr_score = sum(1 for tok in tokens if tok in TURKISH_HINT_TOKENS)
+    if any(ch in TURKISH_SPECIFIC_CHARS for ch in raw):
+        tr_score += 2
+    if TURKISH_SUFFIX_RE.search(raw):
+        tr_score += 2
+    en_hits = {tok for tok in tokens if tok in ENGLISH_HINT_TOKENS}
+    if len(en_hits) >= ENGLISH_MIN_HINT_TOKENS and not tr_score:
+        return "en"
+    if tr_score and not en_hits:
+        return "tr"
+    return None
@@ -36,7 +36,7 @@ from chatbot_module.tools import (
 )
 from chatbot_module.tools_extensions import _score_candidate, build_player_payload_new
 from report_module.utilities import norm_name
-from chatbot_module.metrics import ALLOWED_METRICS, POSITIVE_METRICS
+from chatbot_module.metrics import ALLOWED_METRICS, ALLOWED_METRIC_BY_FOLD, POSITIVE_METRICS
 from constants_module.constants import (
     ALLOWED_SELECTION_LEAGUES,
     CANONICAL_LEAGUES,
@@ -986,10 +986,10 @@ def clean_constraints(raw: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     for item in raw.get("stat_requirements") or []:
         if not isinstance(item, dict):
             continue
-        metric = item.get("metric")
+        metric = ALLOWED_METRIC_BY_FOLD.get(str(item.get("metric") or "").strip().casefold())
         op = item.get("operator")
         value = _num(item.get("value"))
-        if metric not in ALLOWED_METRICS or op not in {">", ">=", "<", "<=", "="} or value is None:
+        if metric is None or op not in {">", ">=", "<", "<=", "="} or value is None:
             continue
         requirements.append({"metric": metric, "operator": op, "value": value})
         if len(requirements) >= 3:
@@ -1,12 +1,14 @@
 from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import text
 import re
-import json
+import sys
 import unicodedata
 from report_module.utilities import _num, _norm, norm_name
 from api_module.utilities import get_db 
+from constants_module.constants import ALLOWED_ROLE_BY_FOLD
+from chatbot_module.tools import invoke_parser_cached, loads_json, strip_heavy_html
 
-META_ID_KEYS = {
+META_ID_KEYS = frozenset({
     # identity / grouping
     "player_name_norm","team_name_norm", "player_key_norm",
     "player_key", "player_name", "name", "player",
@@ -19,7 +21,7 @@ META_ID_KEYS = {
 
     # storage/other (if present)
     "id", "content", "metadata", "vector", "potential", "form",
-}
+})
 
 PROFILE_BLOCK_RE = re.compile(
     r"""
@@ -34,82 +36,98 @@ PROFILE_BLOCK_RE = re.compile(
     re.IGNORECASE | re.VERBOSE
 )
 
-HEAVY_TAGS_RE = re.compile(r"(<img[^>]*>|<table[\s\S]*?</table>)", re.IGNORECASE)
-def strip_heavy_html(text: str) -> str:
-    """Remove <img> (esp. base64) and <table> blocks before sending to LLMs."""
-    return HEAVY_TAGS_RE.sub("", text or "").strip()
+_PROFILE_OPEN = "[[PLAYER_PROFILE:"
+_PROFILE_CLOSE = "[[/PLAYER_PROFILE]]"
 
+def _find_profile_block(text: str) -> Optional[Tuple[str, str]]:
+    """
+    (name, body) of the first profile block, as PROFILE_BLOCK_RE would match it.
+    The canonical shape [[PLAYER_PROFILE:<Name>]] ... [[/PLAYER_PROFILE]] is located
+    with str.find; anything else (other casing/spacing, a PLAYER_STATS close) goes
+    through the regex.
+    """
+    start = text.find("[[")
+    if start < 0:
+        return None
+    if text.startswith(_PROFILE_OPEN, start):
+        name_end = text.find("]]", start + len(_PROFILE_OPEN))
+        if name_end >= 0:
+            name = text[start + len(_PROFILE_OPEN):name_end]
+            body_start = name_end + 2
+            close = text.find("[[", body_start)
+            if name and "]" not in name and close >= 0 and text.startswith(_PROFILE_CLOSE, close):
+                return name.lstrip() or name[-1], text[body_start:close]  # regex: \s* yields the last char to the name
+    m = PROFILE_BLOCK_RE.search(text)
+    return (m.group("name"), m.group("body")) if m else None
+
+# "- <field>..." profile bullets, found with one MULTILINE scan of the body; keys are
+# matched as line prefixes ("- height (cm): 180"), case-folded ASCII-only like str.lower().
+PROFILE_FIELD_RE = re.compile(
+    r"^[^\S\n]*- (?ai:(gender:|height|weight|age|nationality|team|roles|potential|form|match_count))(.*)$",
+    re.MULTILINE,
+)
+PROFILE_FIELD_CONVERTERS = {
+    "gender": str.strip,
+    "height": float,
+    "weight": float,
+    "age": int,
+    "nationality": str.strip,
+    "team": str.strip,
+    "roles": lambda raw: [r.strip() for r in raw.split(",") if r.strip()],
+    "potential": int,
+    "form": int,
+    "match_count": int,
+}
 
 def fallback_parse_profile_block_new(raw_text: str) -> Dict[str, Any]:
     """
     Extended fallback parser capturing gender, height, weight, team.
     """
-    m = PROFILE_BLOCK_RE.search(raw_text or "")
-    if not m:
+    block = _find_profile_block(raw_text or "")
+    if not block:
         return {"players": []}
 
-    name = (m.group("name") or "").strip()
-    body = m.group("body") or ""
-
-    gender = None
-    height = None
-    weight = None
-    age = None
-    nationality = None
-    team = None
-    roles = []
-    potential = None
-    form = None
-    match_count = None
-
-    for line in body.splitlines():
-        ln = line.strip()
-        if ln.lower().startswith("- gender:"):
-            gender = ln.split(":", 1)[1].strip()
-        elif ln.lower().startswith("- height"):
-            try: height = float(ln.split(":", 1)[1])
-            except: pass
-        elif ln.lower().startswith("- weight"):
-            try: weight = float(ln.split(":", 1)[1])
-            except: pass
-        elif ln.lower().startswith("- age"):
-            try: age = int(ln.split(":", 1)[1])
-            except: pass
-        elif ln.lower().startswith("- nationality"):
-            nationality = ln.split(":", 1)[1].strip()
-        elif ln.lower().startswith("- team"):
-            team = ln.split(":", 1)[1].strip()
-        elif ln.lower().startswith("- roles"):
-            role_raw = ln.split(":", 1)[1]
-            roles = [r.strip() for r in role_raw.split(",") if r.strip()]
-        elif ln.lower().startswith("- potential"):
-            try: potential = int(ln.split(":", 1)[1])
-            except: pass
-        elif ln.lower().startswith("- form"):
-            try: form = int(ln.split(":", 1)[1])
-            except: pass
-        elif ln.lower().startswith("- match_count"):
-            try: match_count = int(ln.split(":", 1)[1])
-            except: pass
+    name = (block[0] or "").strip()
+    body = block[1] or ""
+
+    fields: Dict[str, Any] = {"roles": []}
+    # Rejoin on "\n" so every splitlines() boundary (\r\n, \r, ...) is a regex line boundary.
+    for m in PROFILE_FIELD_RE.finditer("\n".join(body.splitlines())):
+        label, rest = m.groups()
+        key = label.lower().rstrip(":")
+        try:
+            # text after the line's first ':' (the converters strip surrounding whitespace)
+            fields[key] = PROFILE_FIELD_CONVERTERS[key]((label + rest).partition(":")[2])
+        except ValueError:
+            pass
 
     return {
         "players": [
             {
                 "name": name,
-                "gender": gender,
-                "height": height,
-                "weight": weight,
-                "age": age,
-                "nationality": nationality,
-                "team": team,
-                "match_count": match_count,
-                "roles": roles,
-                "potential": potential,
-                "form": form,
+                "gender": fields.get("gender"),
+                "height": fields.get("height"),
+                "weight": fields.get("weight"),
+                "age": fields.get("age"),
+                "nationality": fields.get("nationality"),
+                "team": fields.get("team"),
+                "match_count": fields.get("match_count"),
+                "roles": fields["roles"],
+                "potential": fields.get("potential"),
+                "form": fields.get("form"),
             }
         ]
     }
 
+def _clean_roles(roles: Any) -> List[str]:
+    """Map LLM roles onto the allowed role set (canonical spelling); unknown roles are kept only if none match."""
+    if isinstance(roles, str):
+        roles = [roles]
+    raw = [str(r).strip() for r in (roles or []) if r is not None and str(r).strip()]
+    allowed = [ALLOWED_ROLE_BY_FOLD[r.casefold()] for r in raw if r.casefold() in ALLOWED_ROLE_BY_FOLD]
+    return list(dict.fromkeys(allowed)) if allowed else raw
+
+
 def parse_player_meta_new(meta_parser_chain, raw_text: str) -> Dict[str, Any]:
     """
     Extended meta parser supporting gender, height, weight, team, match_count.
@@ -120,9 +138,10 @@ def parse_player_meta_new(meta_parser_chain, raw_text: str) -> Dict[str, Any]:
     # Step 1 — LLM JSON
     data = {}
     try:
-        raw = meta_parser_chain.invoke({"raw_text": safe})
-        data = raw if isinstance(raw, dict) else json.loads(raw)
-    except:
+        raw = invoke_parser_cached(meta_parser_chain, "meta", {"raw_text": safe})
+        data = raw if isinstance(raw, dict) else loads_json(raw)
+    except Exception:
+        # LLM/transport failures as well as malformed JSON fall back to an empty parse
         data = {}
 
     players_out = []
@@ -140,7 +159,7 @@ def parse_player_meta_new(meta_parser_chain, raw_text: str) -> Dict[str, Any]:
             "nationality": p.get("nationality"),
             "team": p.get("team"),
             "match_count": p.get("match_count"),
-            "roles": p.get("roles") or [],
+            "roles": _clean_roles(p.get("roles")),
             "potential": None,
             "form": None,
         }
@@ -153,7 +172,7 @@ def parse_player_meta_new(meta_parser_chain, raw_text: str) -> Dict[str, Any]:
             try:
                 score = int(float(score))
                 score = max(0, min(100, score))
-            except:
+            except (TypeError, ValueError, OverflowError):
                 score = None
             out[score_key] = score
 
@@ -175,26 +194,40 @@ def _extract_stats_from_doc_meta(doc_meta: Dict[str, Any]) -> List[Dict[str, Any
     Your schema: stats are numeric fields directly in metadata.
     Convert them into list-of-dicts: [{"metric": k, "value": v}, ...]
     """
-    out: List[Dict[str, Any]] = []
-    for k, v in (doc_meta or {}).items():
-        if k in META_ID_KEYS:
-            continue
-        nv = _num(v)
-        if nv is None:
-            continue
-        out.append({"metric": str(k), "value": nv})
-    return out
+    # Iterate items() rather than keys() - META_ID_KEYS: a set difference would lose the
+    # metadata's metric order. Metric keys are interned, since every row repeats them.
+    return [
+        {"metric": sys.intern(str(k)), "value": nv}
+        for k, v in (doc_meta or {}).items()
+        if k not in META_ID_KEYS and (nv := _num(v)) is not None
+    ]
+
+# (field, weight, tolerance, fallback metadata keys) for the numeric identity checks
+_SCORE_NUMERIC_FIELDS = (
+    ("age", 2.5, 2.0, ("age_cm", "age_kg")),
+    ("height", 2.0, 4.0, ("height_cm", "height_kg")),
+    ("weight", 2.0, 5.0, ("weight_cm", "weight_kg")),
+)
 
-def _is_non_zero_stat(stat: Dict[str, Any]) -> bool:
-    v = _num(stat.get("value"))
-    return (v is not None) and (abs(v) > 0.05)
+def _identity_for_scoring(ident: Dict[str, Any]) -> Tuple[str, str, str, Tuple[Optional[float], ...]]:
+    """Identity side of _score_candidate, normalized once per lookup instead of once per row."""
+    return (
+        norm_name(ident.get("name") or ""),
+        _norm(ident.get("nationality")),
+        _norm(ident.get("gender")),
+        tuple(_num(ident.get(k)) for k, _, _, _ in _SCORE_NUMERIC_FIELDS),
+    )
 
 def _score_candidate(meta: Dict[str, Any], ident: Dict[str, Any]) -> float:
+    return _score_prepared_candidate(meta, _identity_for_scoring(ident))
+
+def _score_prepared_candidate(
+    meta: Dict[str, Any],
+    prepared: Tuple[str, str, str, Tuple[Optional[float], ...]],
+) -> float:
     score = 0.0
 
-    name_i = norm_name(ident.get("name") or "")
-    nat_i  = _norm(ident.get("nationality"))
-    gen_i  = _norm(ident.get("gender"))
+    name_i, nat_i, gen_i, nums_i = prepared
 
     name_m = meta.get("player_name_norm") or norm_name(meta.get("player_name") or "")
     nat_m  = _norm(meta.get("nationality_name") or meta.get("nationality") or meta.get("country"))
@@ -211,10 +244,11 @@ def _score_candidate(meta: Dict[str, Any], ident: Dict[str, Any]) -> float:
     if gen_i and gen_m and gen_i == gen_m:
         score += 2
 
-    for k, w, tol in [("age", 2.5, 2.0), ("height", 2.0, 4.0), ("weight", 2.0, 5.0)]:
-        iv = _num(ident.get(k))
-        mv = _num(meta.get(k) or meta.get(f"{k}_cm") or meta.get(f"{k}_kg"))
-        if iv is None or mv is None:
+    for iv, (k, w, tol, (cm_key, kg_key)) in zip(nums_i, _SCORE_NUMERIC_FIELDS):
+        if iv is None:
+            continue
+        mv = _num(meta.get(k) or meta.get(cm_key) or meta.get(kg_key))
+        if mv is None:
             continue
         diff = abs(iv - mv)
         if diff <= tol: score += w
@@ -223,120 +257,130 @@ def _score_candidate(meta: Dict[str, Any], ident: Dict[str, Any]) -> float:
     return score
 
 
-def fetch_player_nonzero_stats(
-    db,
-    player_identity: Dict[str, Any],
-    limit_docs: int = 250
-) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def ensure_player_name_search_indexes(conn) -> None:
     """
-    1) Broad candidate search in `player_data` (name + nationality) using BOTH original and folded name
-    2) Score candidates to select best id (int8)
-    3) Fetch that single row by id and collect metadata stats
-    4) Filter out stats that are zero
-    5) Return (stats, resolved_identity_fields) where resolved fields come from the winning row
+    Trigram GIN indexes behind the '%name%' ILIKE lookups in fetch_player_nonzero_stats.
+    ILIKE with a leading wildcard can't use a B-tree, but Postgres plans it as a
+    bitmap scan over gin_trgm_ops indexes, so the queries themselves stay unchanged.
+    Built CONCURRENTLY so player_data stays writable; `conn` must be in autocommit
+    mode. Run once via scripts/ensure_search_indexes.py, not at app startup.
     """
-    name = player_identity.get("name")
-    if not name or not str(name).strip():
-        return [], {}
-
-    name_raw = str(name).strip()
-    name_norm = norm_name(name_raw)
-
-    name_raw_q  = f"%{name_raw}%"
-    name_norm_q = f"%{name_norm}%"
-
-    nat = player_identity.get("nationality")
-    nat_raw = nat.strip() if isinstance(nat, str) else ""
-    nat_q = f"%{nat_raw}%" if nat_raw else None
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for index_name, expr in (
+        ("idx_player_data_name_norm_trgm", "(metadata->>'player_name_norm')"),
+        ("idx_player_data_name_trgm", "(metadata->>'player_name')"),
+        ("idx_player_data_nationality_trgm", "(metadata->>'nationality_name')"),
+    ):
+        conn.execute(text(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}
+            ON player_data
+            USING GIN (({expr}) gin_trgm_ops)
+        """))
+
+# Metadata fields the candidate scan needs: everything _score_candidate compares plus
+# the resolved identity. Stats stay in the database until a winner is picked.
+_CANDIDATE_META_KEYS = (
+    "player_name_norm", "player_name", "nationality_name", "nationality", "country", "gender",
+    "age", "age_cm", "age_kg", "height", "height_cm", "height_kg", "weight", "weight_cm", "weight_kg",
+    "team_name", "team", "position_name", "league_name", "league", "match_count",
+)
+_CANDIDATE_META_SQL = "jsonb_strip_nulls(jsonb_build_object({}))".format(
+    ", ".join(f"'{k}', metadata->'{k}'" for k in _CANDIDATE_META_KEYS)
+)
 
-    # Broad candidate search (name + nationality) with folded variants
-    rows = db.execute(text("""
-        SELECT id, metadata, content
+# Built once at import: text() scans its SQL for bind params on construction, and a
+# stable statement object keeps SQLAlchemy's compiled cache hit on every call.
+# No server-side PREPARE: the engine runs on psycopg2, and a transaction-mode
+# pooler in front of Postgres would not keep prepared statements anyway.
+_CANDIDATE_ROWS_STMT = text(f"""
+    SELECT v.idx, c.id, c.metadata
+    FROM unnest(
+        CAST(:idxs AS int[]),
+        CAST(:name_norm_qs AS text[]),
+        CAST(:name_raw_qs AS text[]),
+        CAST(:nat_qs AS text[])
+    ) AS v(idx, name_norm_q, name_raw_q, nat_q)
+    CROSS JOIN LATERAL (
+        SELECT id, {_CANDIDATE_META_SQL} AS metadata
         FROM player_data
         WHERE
         (
-            (metadata->>'player_name_norm') ILIKE :name_norm_q
-            OR (metadata->>'player_name') ILIKE :name_raw_q
-            OR (content ILIKE :name_raw_q)
+            (metadata->>'player_name_norm') ILIKE v.name_norm_q
+            OR (metadata->>'player_name') ILIKE v.name_raw_q
+            OR (content ILIKE v.name_raw_q)
         )
         AND (
-            :nat_q IS NULL
-            OR (metadata->>'nationality_name') ILIKE :nat_q
-            OR (content ILIKE :nat_q)
+            v.nat_q IS NULL
+            OR (metadata->>'nationality_name') ILIKE v.nat_q
+            OR (content ILIKE v.nat_q)
         )
         ORDER BY id DESC
         LIMIT :lim
-    """), {
-        "name_norm_q": name_norm_q,
-        "name_raw_q": name_raw_q,
-        "nat_q": nat_q,
+    ) AS c
+    ORDER BY v.idx, c.id DESC
+""")
+
+def _fetch_candidate_rows(
+    db,
+    specs: List[Tuple[int, str, str, Optional[str]]],
+    limit_docs: int,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Candidate rows for several lookups in one round-trip.
+    specs are (idx, name_norm_q, name_raw_q, nat_q); each input gets its own
+    LATERAL scan with the per-player LIMIT, rows come back grouped by idx, id DESC.
+    """
+    idxs, name_norm_qs, name_raw_qs, nat_qs = (list(col) for col in zip(*specs))
+    rows = db.execute(_CANDIDATE_ROWS_STMT, {
+        "idxs": idxs,
+        "name_norm_qs": name_norm_qs,
+        "name_raw_qs": name_raw_qs,
+        "nat_qs": nat_qs,
         "lim": int(limit_docs),
     }).mappings().all()
 
-    # ✅ fallback: name-only search if nothing returned
-    if not rows:
-        rows = db.execute(text("""
-            SELECT id, metadata, content
-            FROM player_data
-            WHERE
-            (
-                (metadata->>'player_name_norm') ILIKE :name_norm_q
-                OR (metadata->>'player_name') ILIKE :name_raw_q
-                OR (content ILIKE :name_raw_q)
-            )
-            ORDER BY id DESC
-            LIMIT :lim
-        """), {
-            "name_norm_q": name_norm_q,
-            "name_raw_q": name_raw_q,
-            "lim": int(limit_docs),
-        }).mappings().all()
-    if not rows:
-        return [], {}
-    
-    # pick best id (each row == one player)
-    best: Tuple[float, Optional[int]] = (-1.0, None)
+    by_idx: Dict[int, List[Dict[str, Any]]] = {}
     for r in rows:
-        meta = r.get("metadata") or {}
-        sc = _score_candidate(meta, player_identity)
-        rid = r.get("id")
-        if rid is not None and sc > best[0]:
-            best = (sc, int(rid))
-    best_id = best[1]
-    if best_id is None:
-        # fallback: extract stats from broad rows
-        raw_stats: List[Dict[str, Any]] = []
-        for r in rows:
-            doc_meta = r.get("metadata") or {}
-            raw_stats.extend(_extract_stats_from_doc_meta(doc_meta))
-        nonzero = [s for s in raw_stats if _is_non_zero_stat(s)]
-        return nonzero, {}
-
-    # fetch the single player row by id
-    doc = db.execute(text("""
-        SELECT id, metadata
-        FROM player_data
-        WHERE id = :id
-        LIMIT 1
-    """), {"id": best_id}).mappings().first()
-
-    if not doc:
-        return [], {}
+        by_idx.setdefault(r["idx"], []).append(r)
+    return by_idx
+
+_STAT_ID_KEYS = sorted(META_ID_KEYS)
+_STAT_ROWS_STMT = text("""
+    SELECT pd.id, e.key, e.value
+    FROM player_data pd
+    CROSS JOIN LATERAL jsonb_each(pd.metadata) WITH ORDINALITY AS e(key, value, ord)
+    WHERE pd.id = ANY(:ids)
+      AND e.key <> ALL(:id_keys)
+      AND NOT CASE WHEN jsonb_typeof(e.value) = 'number'
+                   THEN abs((e.value #>> '{}')::numeric) <= 0.05
+                   ELSE false END
+    ORDER BY pd.id, e.ord
+""")
+
+def _fetch_stat_rows(db, ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+    """Non-zero stat pairs per player row, in stored order; ID keys and zero numbers are dropped server-side."""
+    rows = db.execute(_STAT_ROWS_STMT, {"ids": ids, "id_keys": _STAT_ID_KEYS}).mappings().all()
+
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    for r in rows:
+        by_id.setdefault(r["id"], {})[r["key"]] = r["value"]
+    return by_id
 
+def _resolve_winner(doc: Dict[str, Any], stat_meta: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    # identity fields of the winning row came with the candidate scan
     doc_meta = doc.get("metadata") or {}
 
-    # stats
-    raw_stats = _extract_stats_from_doc_meta(doc_meta)
-    nonzero = [s for s in raw_stats if _is_non_zero_stat(s)]
-
-    # optional dedupe
+    # stats: drop near-zero values and dedupe on the normalized metric name in one pass
     seen = set()
     deduped: List[Dict[str, Any]] = []
-    for s in nonzero:
-        key = _norm(str(s.get("metric") or s.get("stat") or s.get("label") or "")) or None
-        if key and key in seen:
+    for s in _extract_stats_from_doc_meta(stat_meta):
+        # values are already floats from _num; "not >" also drops NaN
+        if not abs(s["value"]) > 0.05:
             continue
+        key = _norm(s["metric"])
         if key:
+            if key in seen:
+                continue
             seen.add(key)
         deduped.append(s)
 
@@ -368,78 +412,155 @@ def fetch_player_nonzero_stats(
     if "age" in resolved:
         try:
             resolved["age"] = int(round(float(resolved["age"])))
-        except:
+        except (TypeError, ValueError, OverflowError):
             # if conversion fails, remove to avoid bad overwrite
             resolved.pop("age", None)
 
     return deduped, resolved
 
+def fetch_players_nonzero_stats(
+    db,
+    player_identities: List[Dict[str, Any]],
+    limit_docs: int = 250
+) -> List[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Batched fetch_player_nonzero_stats: one (stats, resolved) pair per identity, in order.
+    1) Broad candidate search (name + nationality) for every identity in one query
+    2) Name-only search, again in one query, for identities that found nothing
+    3) Score candidates per identity (identity fields only) to select the best row
+    4) Fetch the winners' non-zero metadata stats in one query, filtered in Postgres
+    5) Dedupe stats and resolve identity fields from each winning row
+    """
+    results: List[Tuple[List[Dict[str, Any]], Dict[str, Any]]] = [([], {}) for _ in player_identities]
+
+    specs: List[Tuple[int, str, str, Optional[str]]] = []
+    for idx, player_identity in enumerate(player_identities):
+        name = player_identity.get("name")
+        if not name or not str(name).strip():
+            continue
+        name_raw = str(name).strip()
+        nat = player_identity.get("nationality")
+        nat_raw = nat.strip() if isinstance(nat, str) else ""
+        specs.append((
+            idx,
+            f"%{norm_name(name_raw)}%",
+            f"%{name_raw}%",
+            f"%{nat_raw}%" if nat_raw else None,
+        ))
+    if not specs:
+        return results
+
+    # Broad candidate search (name + nationality) with folded variants
+    rows_by_idx = _fetch_candidate_rows(db, specs, limit_docs)
+
+    # ✅ fallback: name-only search for identities that returned nothing
+    retry = [(idx, norm_q, raw_q, None) for idx, norm_q, raw_q, _ in specs if idx not in rows_by_idx]
+    if retry:
+        rows_by_idx.update(_fetch_candidate_rows(db, retry, limit_docs))
+
+    # pick best row per identity (each row == one player)
+    winners: Dict[int, Dict[str, Any]] = {}
+    for idx, rows in rows_by_idx.items():
+        best_score = -1.0
+        doc = None
+        prepared = _identity_for_scoring(player_identities[idx])
+        for r in rows:
+            meta = r.get("metadata") or {}
+            sc = _score_prepared_candidate(meta, prepared)
+            if r.get("id") is not None and sc > best_score:
+                best_score, doc = sc, r
+        # doc stays None only for id-less rows; candidate rows carry identity fields, not stats
+        if doc is not None:
+            winners[idx] = doc
+    if not winners:
+        return results
+
+    stats_by_id = _fetch_stat_rows(db, list({doc["id"] for doc in winners.values()}))
+    for idx, doc in winners.items():
+        results[idx] = _resolve_winner(doc, stats_by_id.get(doc["id"], {}))
+    return results
+
+def fetch_player_nonzero_stats(
+    db,
+    player_identity: Dict[str, Any],
+    limit_docs: int = 250
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Single-player form of fetch_players_nonzero_stats: (stats, resolved_identity_fields)."""
+    return fetch_players_nonzero_stats(db, [player_identity], limit_docs)[0]
+
 def build_player_payload_new(meta: Dict[str, Any]) -> Dict[str, Any]:
     """
     Build payload and overwrite team/age/height/weight (and optionally gender/nationality/league/match_count)
     from the winning DB row, if present.
     """
-    meta_by = {(p["name"]).strip(): p for p in meta.get("players", []) if p.get("name")}
-    names = sorted(set(meta_by.keys()))
+    # One pass indexes players by name; dict keys are already unique, so no extra set() pass.
+    # Players keep the order the answer mentions them in.
+    meta_by = {p["name"].strip(): p for p in meta.get("players", []) if p.get("name")}
     output = {"players": []}
 
+    identities = [
+        {
+            "name": name,
+            "team": m.get("team"),
+            "nationality": m.get("nationality"),
+            "gender": m.get("gender"),
+            "age": m.get("age"),
+            "height": m.get("height"),
+            "weight": m.get("weight"),
+        }
+        for name, m in meta_by.items()
+    ]
+    if not identities:
+        return output
+
+    # All players resolve together: a fixed number of round-trips regardless of player count
     db = get_db()
     try:
-        for name in names:
-            m = meta_by.get(name, {}) or {}
-
-            player_identity = {
-                "name": name,
-                "team": m.get("team"),
-                "nationality": m.get("nationality"),
-                "gender": m.get("gender"),
-                "age": m.get("age"),
-                "height": m.get("height"),
-                "weight": m.get("weight"),
-            }
-            stats, resolved = fetch_player_nonzero_stats(db, player_identity)
-
-            # overwrite only if resolved has values (resolved has no None/empty keys)
-            team_final   = resolved.get("team", m.get("team"))
-            age_final    = resolved.get("age", m.get("age"))
-            height_final = resolved.get("height", m.get("height"))
-            weight_final = resolved.get("weight", m.get("weight"))
-
-            # optional but usually helpful to reduce confusion:
-            nat_final        = resolved.get("nationality", m.get("nationality"))
-            gender_final     = resolved.get("gender", m.get("gender"))
-            match_count_final= resolved.get("match_count", m.get("match_count"))
-            pos_final = resolved.get("position_name", m.get("position_name"))
-            league_final = resolved.get("league_name", m.get("league_name"))
-
-            # Prefer DB position -> roles (frontend consumes roles)
-            roles_final = m.get("roles") or []
-            if pos_final:
-                roles_final = [str(pos_final)]
-            elif not roles_final:
-                roles_final = []
-
-
-            output["players"].append({
-                "name": name,
-                "meta": {
-                    "gender": gender_final,
-                    "height": height_final,
-                    "weight": weight_final,
-                    "nationality": nat_final,
-                    "position_name": pos_final,
-                    "team": team_final,
-                    "league": league_final,
-                    "league_name": league_final,
-                    "match_count": match_count_final,
-                    "age": age_final,
-                    "roles": roles_final,
-                    "potential": m.get("potential"),
-                    "form": m.get("form"),
-                },
-                "stats": stats or []
-            })
-
-        return output
+        fetched = fetch_players_nonzero_stats(db, identities)
     finally:
         db.close()
+
+    for (name, m), (stats, resolved) in zip(meta_by.items(), fetched):
+
+        # overwrite only if resolved has values (resolved has no None/empty keys)
+        team_final   = resolved.get("team", m.get("team"))
+        age_final    = resolved.get("age", m.get("age"))
+        height_final = resolved.get("height", m.get("height"))
+        weight_final = resolved.get("weight", m.get("weight"))
+
+        # optional but usually helpful to reduce confusion:
+        nat_final        = resolved.get("nationality", m.get("nationality"))
+        gender_final     = resolved.get("gender", m.get("gender"))
+        match_count_final= resolved.get("match_count", m.get("match_count"))
+        pos_final = resolved.get("position_name", m.get("position_name"))
+        league_final = resolved.get("league_name", m.get("league_name"))
+
+        # Prefer DB position -> roles (frontend consumes roles)
+        roles_final = m.get("roles") or []
+        if pos_final:
+            roles_final = [str(pos_final)]
+        elif not roles_final:
+            roles_final = []
+
+
+        output["players"].append({
+            "name": name,
+            "meta": {
+                "gender": gender_final,
+                "height": height_final,
+                "weight": weight_final,
+                "nationality": nat_final,
+                "position_name": pos_final,
+                "team": team_final,
+                "league": league_final,
+                "league_name": league_final,
+                "match_count": match_count_final,
+                "age": age_final,
+                "roles": roles_final,
+                "potential": m.get("potential"),
+                "form": m.get("form"),
+            },
+            "stats": stats or []
+        })
+
+    return output
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+
+from cachetools import LRUCache, TTLCache
 
 from dotenv import load_dotenv
 
@@ -46,7 +52,91 @@ def _get_embeddings():
 import logging
 log = logging.getLogger(__name__)
 
+# Query text -> embedding. Repeated probes ("Mauro Icardi", the same follow-up
+# retrieval query across passes) skip the OpenAI round-trip.
+_QUERY_EMBEDDING_CACHE: LRUCache = LRUCache(maxsize=4096)
+_QUERY_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+
+def embed_query_cached(query: str) -> Tuple[float, ...]:
+    """Embed a single query, memoized on its stripped text (case is kept; it changes the vector)."""
+    q = (query or "").strip()
+    with _QUERY_EMBEDDING_CACHE_LOCK:
+        vec = _QUERY_EMBEDDING_CACHE.get(q)
+    if vec is None:
+        vec = tuple(_get_embeddings().embed_query(q))
+        with _QUERY_EMBEDDING_CACHE_LOCK:
+            _QUERY_EMBEDDING_CACHE[q] = vec
+    return vec
+
+
+# (normalized query text, k, filter) -> find_player rows for 15 minutes. A hit skips
+# both the embedding call and the pgvector scan ("Messi", "Haaland" repeat heavily).
+FIND_PLAYER_RESULT_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=900)
+_FIND_PLAYER_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _result_cache_key(query: str, k: int, metadata_filter: Optional[Dict[str, Any]]) -> bytes:
+    norm_q = " ".join((query or "").lower().split())
+    filter_json = json.dumps(metadata_filter, sort_keys=True, default=str) if metadata_filter else ""
+    raw = norm_q.encode("utf-8") + k.to_bytes(2, "little") + filter_json.encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _find_player_rows(
+    q_vec: Sequence[float],
+    k: int,
+    metadata_filter: Optional[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    resp = _get_supabase_client().rpc(
+        "find_player",
+        _find_player_params(q_vec, k, metadata_filter),
+    ).execute()
+    return getattr(resp, "data", None) or []
+
+
+def _find_player_params(
+    q_vec: Sequence[float],
+    k: int,
+    metadata_filter: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    return {
+        "query_embedding": list(q_vec),
+        "match_count": k,
+        "metadata_filter": metadata_filter,
+    }
+
+
+def _rows_to_documents(rows: List[Dict[str, Any]]) -> List[Document]:
+    docs: List[Document] = []
+
+    for r in rows:
+        if not r:
+            continue
+
+        distance = r.get("distance")
+        # turn distance into a similarity score (1 - normalized distance) if you like
+        similarity = None
+        if isinstance(distance, (int, float)):
+            try:
+                similarity = 1.0 / (1.0 + float(distance))
+            except Exception:
+                similarity = None
+
+        md: Dict[str, Any] = (r.get("metadata") or {}) | {
+            "id": r.get("id"),
+            "distance": distance,
+            "similarity": similarity,
+        }
+
+        docs.append(
+            Document(
+                page_content=r.get("content") or "",
+                metadata=md,
+            )
+        )
 
+    return docs
 
 
 # -------------------------------------------------------------------
@@ -64,57 +154,29 @@ class SupabaseRPCRetriever(BaseRetriever):
         if not q:
             return []
 
+        cache_key = _result_cache_key(q, self.k, self.metadata_filter)
+        with _FIND_PLAYER_RESULT_CACHE_LOCK:
+            rows = FIND_PLAYER_RESULT_CACHE.get(cache_key)
+        if rows is not None:
+            return _rows_to_documents(rows)
+
         try:
             # 1) embed query
-            q_vec = _get_embeddings().embed_query(q)
+            q_vec = embed_query_cached(q)
 
             # 2) call Postgres function on documents
-            resp = _get_supabase_client().rpc(
-                "find_player",
-                {
-                    "query_embedding": q_vec,
-                    "match_count": self.k,
-                    "metadata_filter": self.metadata_filter,
-                },
-            ).execute()
+            rows = _find_player_rows(q_vec, self.k, self.metadata_filter)
         except Exception as e:
             log.exception("Retriever failed: %s", e)
             return []
 
-        rows = getattr(resp, "data", None) or []
-        docs: List[Document] = []
-
-        for r in rows:
-            if not r:
-                continue
-
-            distance = r.get("distance")
-            # turn distance into a similarity score (1 - normalized distance) if you like
-            similarity = None
-            if isinstance(distance, (int, float)):
-                try:
-                    similarity = 1.0 / (1.0 + float(distance))
-                except Exception:
-                    similarity = None
-
-            md: Dict[str, Any] = (r.get("metadata") or {}) | {
-                "id": r.get("id"),
-                "distance": distance,
-                "similarity": similarity,
-            }
-
-            docs.append(
-                Document(
-                    page_content=r.get("content") or "",
-                    metadata=md,
-                )
-            )
-
-        return docs
+        with _FIND_PLAYER_RESULT_CACHE_LOCK:
+            FIND_PLAYER_RESULT_CACHE[cache_key] = rows
+        return _rows_to_documents(rows)
 
     async def _aget_relevant_documents(self, query: str) -> List[Document]:
-        # simple async passthrough
-        return self._get_relevant_documents(query)
+        # run the blocking embed + RPC off the event loop
+        return await asyncio.to_thread(self._get_relevant_documents, query)
 
 
 def get_retriever(
@@ -130,3 +192,4 @@ def get_retriever(
         k=k,
         metadata_filter=filter,
     )
+
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+
 # Shared football/domain vocabularies used across enterprise modules.
 # PLAYER_DATA_LEAGUES and PLAYER_DATA_TEAMS were generated from DISTINCT player_data metadata on 2026-07-20.
 
@@ -30,6 +32,19 @@ ROLE_SHORT_TO_LONG = {
     "RW": "Right Wing",
 }
 
+# Role names the LLM prompts allow, in prompt order (interned, shared with parsed LLM output).
+ALLOWED_ROLES = tuple(map(sys.intern, (
+    "Goalkeeper", "Goal Keeper", "Left Wing Back", "Left Back", "Left Center Back", "Centre Back",
+    "Center Back", "Right Center Back", "Right Back", "Right Wing Back", "Left Midfield",
+    "Left Defensive Midfield", "Left Center Midfield", "Left Attacking Midfield",
+    "Central Midfield", "Center Attacking Midfield", "Center Defensive Midfield",
+    "Defensive Midfield", "Right Center Midfield", "Right Midfield", "Right Defensive Midfield",
+    "Right Attacking Midfield", "Attacking Midfield", "Center Forward", "Centre Forward",
+    "Attacker", "Right Center Forward", "Left Center Forward", "Left Wing", "Right Wing",
+)))
+# Case-insensitive lookup back to the canonical spelling ("center back" -> "Center Back").
+ALLOWED_ROLE_BY_FOLD = {role.casefold(): role for role in ALLOWED_ROLES}
+
 ROLE_LONG_TO_SHORT = {
     **{long.lower(): short for short, long in ROLE_SHORT_TO_LONG.items()},
     "g": "GK",
@@ -1,15 +1,28 @@
 import re
+import functools
 from typing import Any, Dict, List, Optional
 from sqlalchemy import text
 import unicodedata
 
 def _num(v: Any) -> Optional[float]:
+    if isinstance(v, str):
+        # metadata repeats the same numeric strings (and non-numeric labels) across rows
+        return _num_str(v)
     try:
         if v is None: return None
         return float(v)
     except:
         return None
-    
+
+@functools.lru_cache(maxsize=8192)
+def _num_str(v: str) -> Optional[float]:
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+# Name/label normalizers run per candidate row on a small set of repeating values.
+@functools.lru_cache(maxsize=8192)
 def norm_name(s: str) -> str:
     s = (s or "").strip().lower()
     s = unicodedata.normalize("NFKD", s)
@@ -18,6 +31,7 @@ def norm_name(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s
     
+@functools.lru_cache(maxsize=8192)
 def _norm(s: Optional[str]) -> str:
     return re.sub(r"\s+", " ", (s or "")).strip().lower()
 
@@ -0,0 +1,15 @@
+# scripts/ensure_search_indexes.py
+from api_module.database import engine
+from chatbot_module.tools_extensions import ensure_player_name_search_indexes
+
+def main():
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print("BUILDING PLAYER NAME TRIGRAM INDEXES...")
+        ensure_player_name_search_indexes(conn)
+        print("INDEXES READY.")
+
+if __name__ == "__main__":
+    print("STARTING SEARCH INDEX SETUP")
+    main()
+    print("ENDING SEARCH INDEX SETUP")